@@ -19,18 +19,230 @@ Version: 1.0.0
 License: Unlicense
 """
 
+import functools
+import hashlib
 import os
+import re
 import subprocess
-import argparse
-from typing import Dict, Any, Optional
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from enum import Enum
 
+# orjson parses LLM responses considerably faster; the stdlib is the fallback
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 # Set up environment for CrewAI
 os.environ["CREWAI_TRACING_ENABLED"] = "false"
 os.environ["LLM_PROVIDER"] = "ollama"
 os.environ["OLLAMA_MODEL"] = "llama3"
 
-from crewai import Agent, Task, Crew, Process, LLM
+
+@functools.lru_cache(maxsize=1)
+def _import_crewai():
+    """
+    Import CrewAI on first use.
+    
+    CrewAI pulls in a large dependency tree, so it is only imported when an
+    agent is constructed rather than at module import time. This keeps
+    `--help` and error paths fast.
+    
+    Returns:
+        module or None: The crewai module, or None if it is not installed, in
+            which case the agents use their rule-based fallbacks.
+    """
+    try:
+        import crewai
+    except ImportError:
+        return None
+    return crewai
+
+
+def _diff_key(git_diff: str, file_names: Optional[List[str]] = None) -> bytes:
+    """
+    Return a short digest identifying a diff for in-process caches.
+    
+    BLAKE2b is used because it is fast on large inputs; collision resistance
+    against adversaries does not matter here. The changed file names, when
+    listed separately, are part of the key, since a diff truncated at
+    MAX_DIFF_BYTES does not show them all.
+    """
+    digest = hashlib.blake2b(git_diff.encode("utf-8", "surrogatepass"), digest_size=16)
+    for file_name in file_names or ():
+        digest.update(b"\0" + file_name.encode("utf-8", "surrogatepass"))
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_llm():
+    """
+    Return the LLM client shared by all agents.
+    
+    Using one client keeps a single connection to Ollama and avoids the server
+    reloading the model for interleaved requests from separate clients.
+    
+    Returns:
+        LLM: The CrewAI LLM instance for the local Ollama model
+    """
+    return _import_crewai().LLM(model="ollama/llama3:latest", base_url="http://localhost:11434")
+
+
+@functools.lru_cache(maxsize=None)
+def _crew_agent(role: str, goal: str, backstory: str):
+    """
+    Return the CrewAI agent for a role, creating it once per process.
+    
+    The agents carry no per-generation state, so every generator instance can
+    reuse the same Agent objects instead of rebuilding them.
+    
+    Returns:
+        Agent: The CrewAI agent using the shared LLM
+    """
+    return _import_crewai().Agent(
+        role=role,
+        goal=goal,
+        backstory=backstory,
+        verbose=False,
+        allow_delegation=False,
+        llm=_shared_llm()
+    )
+
+
+class Analysis(NamedTuple):
+    """
+    Result of classifying a diff.
+    
+    Attributes:
+        change_type (str): The type of change (feat, fix, docs, etc.)
+        scope (str): The scope of the change (auth, api, ui, etc.)
+        confidence (str): Confidence level (high, medium, low)
+        reasoning (str): Brief explanation of the classification
+        files (tuple): Changed file paths
+    
+    Example:
+        >>> analysis = Analysis("feat", "auth", "medium", files=("src/auth.py",))
+        >>> analysis.change_type
+        'feat'
+    """
+    change_type: str
+    scope: str
+    confidence: str
+    reasoning: str = ""
+    files: Tuple[str, ...] = ()
+
+
+# Upper bound on diff text read from git and forwarded to the LLM. Larger diffs
+# are truncated at the last complete line to keep memory and prompt size bounded.
+MAX_DIFF_BYTES = 65_536
+
+# Appended to a diff cut at MAX_DIFF_BYTES, in the style of git's own
+# "\ No newline at end of file" lines, so readers know the diff is incomplete
+_TRUNCATED_DIFF_NOTE = "\\ Diff truncated\n"
+
+# Commits compared when no range or staged changes are requested
+DEFAULT_COMMIT_RANGE = "HEAD~1 HEAD"
+
+# Number of analyses (per DiffAnalysisAgent) and generated messages (per
+# CommitMessageGenerator) remembered, oldest evicted first
+ANALYSIS_CACHE_SIZE = 128
+MESSAGE_CACHE_SIZE = 128
+
+
+# Matches "diff --git a/<old> b/<new>" headers anywhere in a multi-line diff
+_DIFF_HEADER_PATTERN = re.compile(r'^diff --git a/(.+?) b/(.+?)$', re.MULTILINE)
+
+# Separates commits in the `git log` output read by GitService.get_log_diffs and
+# GitService.get_log_files
+_COMMIT_SEPARATOR = "###COMMIT "
+
+# File categories used by the fallback rules, by path prefix, exact base name or
+# extension (in that order of precedence). Other files are categorized as "other".
+_FILE_PREFIX_CATEGORIES = ((".github/workflows/", "ci"),)
+_FILE_NAME_CATEGORIES = {
+    "README.md": "readme",
+    "README.rst": "readme",
+    "README": "readme",
+    ".gitlab-ci.yml": "ci",
+    ".travis.yml": "ci",
+    "azure-pipelines.yml": "ci",
+    "Jenkinsfile": "ci",
+    "Dockerfile": "build",
+    "Makefile": "build",
+    "setup.py": "build",
+    "setup.cfg": "build",
+    "pyproject.toml": "build",
+    "requirements.txt": "build",
+    "package.json": "build",
+}
+_FILE_EXTENSION_CATEGORIES = {
+    "md": "markdown",
+    "markdown": "markdown",
+    "rst": "docs",
+    "py": "code",
+    "pyi": "code",
+    "pyx": "code",
+}
+
+# Rule-based fallbacks used when the LLM is unavailable or returns invalid output.
+# Rules are (category, analysis, exclusive) and are checked in order: a
+# non-exclusive rule applies if any changed file is in the category, an
+# exclusive one only if every file is. The first rule that applies wins.
+_FALLBACK_RULES = (
+    ("readme", Analysis("docs", "readme", "high"), False),
+    ("markdown", Analysis("docs", "markdown", "high"), False),
+    ("docs", Analysis("docs", "maintenance", "high"), False),
+    ("ci", Analysis("ci", "maintenance", "high"), True),
+    ("build", Analysis("build", "maintenance", "high"), True),
+    ("code", Analysis("feat", "code", "high"), False),
+)
+_DEFAULT_FALLBACK_ANALYSIS = Analysis("chore", "maintenance", "low")
+
+_SUMMARY_TEMPLATES = {
+    "feat": "Add new {scope} functionality",
+    "fix": "Fix {scope} issues",
+    "docs": "Update {scope} documentation",
+}
+_DEFAULT_SUMMARY_TEMPLATE = "Update {scope} components"
+
+# Commit descriptions for specific (change_type, scope) pairs, then per change type
+_DESCRIPTIONS = {
+    ("feat", "auth"): "add authentication features",
+    ("feat", "api"): "add new API endpoints",
+    ("feat", "ui"): "add new user interface",
+    ("fix", "validation"): "fix validation issues",
+    ("fix", "bug"): "fix critical bugs",
+    ("docs", "api"): "update API documentation",
+    ("docs", "readme"): "update README",
+    ("docs", "markdown"): "update markdown documentation",
+}
+_DEFAULT_DESCRIPTIONS = {
+    "feat": "add new functionality",
+    "fix": "fix issues and bugs",
+    "docs": "update documentation",
+    "refactor": "refactor code structure",
+    "test": "add or update tests",
+    "style": "improve code formatting",
+    "build": "update build configuration",
+    "ci": "update CI/CD pipeline",
+}
+_DEFAULT_DESCRIPTION = "maintain codebase"
+
+
+def _compose_fallback_summary(change_type: str, scope: str) -> str:
+    """Build a fallback summary from the change type's template."""
+    return _SUMMARY_TEMPLATES.get(change_type, _DEFAULT_SUMMARY_TEMPLATE).format(scope=scope)
+
+
+def _compose_fallback_message(change_type: str, scope: Optional[str]) -> str:
+    """Build a fallback commit message; the "maintenance" scope is omitted."""
+    description = (
+        _DESCRIPTIONS.get((change_type, scope))
+        or _DEFAULT_DESCRIPTIONS.get(change_type, _DEFAULT_DESCRIPTION)
+    )
+    scope_part = f"({scope})" if scope and scope != "maintenance" else ""
+    return f"{change_type}{scope_part}: {description}"
 
 
 class ChangeType(Enum):
@@ -103,6 +315,24 @@ class Scope(Enum):
     MAINTENANCE = "maintenance"
 
 
+# Fallback summaries and complete fallback messages for every known
+# (change_type, scope) pair, built once so the rule-based summary and formatter
+# are single dict lookups
+_FALLBACK_SUMMARIES = {
+    (change_type, scope): _compose_fallback_summary(change_type, scope)
+    for change_type in [member.value for member in ChangeType]
+    for scope in [member.value for member in Scope]
+}
+_FALLBACK_MESSAGES = {
+    (change_type, scope): _compose_fallback_message(change_type, scope)
+    for change_type in [member.value for member in ChangeType]
+    for scope in [member.value for member in Scope] + [None]
+}
+_FALLBACK_MESSAGES.update(
+    (key, _compose_fallback_message(*key)) for key in _DESCRIPTIONS
+)
+
+
 class DiffAnalysisAgent:
     """
     Agent 1: Diff Analysis Agent
@@ -125,20 +355,31 @@ class DiffAnalysisAgent:
         - Determine scope (auth, api, ui, etc.)
         - Provide confidence level for classification
     
+    Args:
+        use_llm (bool): If False, skip CrewAI and use the rule-based analysis only
+    
     Attributes:
-        llm (LLM): The language model for analysis
-        agent (Agent): The CrewAI agent instance
+        llm (LLM): The language model for analysis, or None without an LLM
+        agent (Agent): The CrewAI agent instance, or None without an LLM
+        _cache (dict): Recent analyses keyed by diff digest
     
     Example:
         >>> analyzer = DiffAnalysisAgent()
         >>> result = analyzer.analyze_diff(git_diff_string)
-        >>> print(result['change_type'])
+        >>> print(result.change_type)
         'feat'
     """
     
-    def __init__(self):
-        self.llm = LLM(model="ollama/llama3:latest", base_url="http://localhost:11434")
-        self.agent = Agent(
+    __slots__ = ("llm", "agent", "_cache")
+    
+    def __init__(self, use_llm: bool = True):
+        self._cache = {}
+        if not use_llm or _import_crewai() is None:
+            self.llm = None
+            self.agent = None
+            return
+        self.llm = _shared_llm()
+        self.agent = _crew_agent(
             role="Diff Analysis Expert",
             goal="Analyze git diffs to identify the primary purpose and type of change",
             backstory="""You are an expert software engineer with deep experience in
@@ -146,10 +387,7 @@ class DiffAnalysisAgent:
             identifying the nature of changes - whether they are new features,
             bug fixes, refactoring, documentation updates, or other types of changes.
             You understand conventional commit standards and can accurately classify
-            changes into appropriate categories.""",
-            verbose=False,
-            allow_delegation=False,
-            llm=self.llm
+            changes into appropriate categories."""
         )
     
     def _extract_file_names(self, git_diff: str) -> list:
@@ -157,8 +395,9 @@ class DiffAnalysisAgent:
         Extract file names from git diff output.
         
         This method parses the git diff string to extract the names of files
-        that have been modified, added, or deleted. It uses regex pattern matching
-        to identify the file paths from the diff headers.
+        that have been modified, added, or deleted. A precompiled multi-line
+        pattern jumps straight to the diff headers, so the diff is never split
+        into individual lines.
         
         Args:
             git_diff (str): The git diff string to parse
@@ -173,17 +412,10 @@ class DiffAnalysisAgent:
             >>> print(files)
             ['src/main.py']
         """
-        import re
-        file_pattern = r'^diff --git a/(.+?) b/(.+?)$'
-        files = []
-        for line in git_diff.split('\n'):
-            match = re.match(file_pattern, line)
-            if match:
-                file_path = match.group(2)  # Use the 'b/' path (new file path)
-                files.append(file_path)
-        return files
+        # Use the 'b/' path (new file path)
+        return [match.group(2) for match in _DIFF_HEADER_PATTERN.finditer(git_diff)]
     
-    def analyze_diff(self, git_diff: str) -> Dict[str, Any]:
+    def analyze_diff(self, git_diff: str, file_names: Optional[List[str]] = None) -> Analysis:
         """
         Analyze git diff using CrewAI agent.
         
@@ -192,28 +424,65 @@ class DiffAnalysisAgent:
         classify the changes according to conventional commit standards.
         
         The method includes robust fallback mechanisms that use rule-based
-        analysis if the LLM fails or returns invalid results.
+        analysis if the LLM fails or returns invalid results. Results are
+        cached by diff digest, so analyzing the same diff again is a lookup;
+        since an Analysis is immutable the cached result is returned as is.
+        The fallback used after an LLM failure is not cached.
+        Empty or whitespace-only diffs are classified as chore immediately,
+        without hashing or calling the LLM.
         
         Args:
             git_diff (str): The git diff string to analyze
+            file_names (Optional[List[str]]): The changed file paths, if known
+                independently of the diff (e.g. from 'git diff --name-only').
+                Needed when the diff is truncated; by default they are read
+                from the diff headers.
             
         Returns:
-            Dict[str, Any]: Analysis results containing:
-                - change_type (str): The type of change (feat, fix, docs, etc.)
-                - scope (str): The scope of the change (auth, api, ui, etc.)
-                - confidence (str): Confidence level (high, medium, low)
-                - reasoning (str): Brief explanation of the classification
-                - files (list): List of changed file paths
+            Analysis: The change type, scope, confidence, reasoning and
+                changed file paths
                 
         Example:
             >>> analyzer = DiffAnalysisAgent()
             >>> result = analyzer.analyze_diff(git_diff_string)
-            >>> print(result['change_type'])
+            >>> print(result.change_type)
             'feat'
-            >>> print(result['scope'])
+            >>> print(result.scope)
             'auth'
         """
-        file_names = self._extract_file_names(git_diff)
+        if not git_diff or git_diff.isspace():
+            return _DEFAULT_FALLBACK_ANALYSIS
+        
+        key = _diff_key(git_diff, file_names)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if file_names is None:
+            file_names = self._extract_file_names(git_diff)
+        analysis = self._analyze_diff(git_diff, file_names)
+        if analysis is None:
+            # The LLM failed; the fallback is not cached so the diff is retried
+            return self._fallback_analysis(file_names)
+        if len(self._cache) >= ANALYSIS_CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = analysis
+        return analysis
+    
+    def _analyze_diff(self, git_diff: str, file_names: List[str]) -> Optional[Analysis]:
+        """Analyze a diff with the LLM, or the rule-based fallback, without caching.
+        
+        Returns None if the LLM fails or returns invalid results.
+        """
+        if self.agent is None:
+            return self._fallback_analysis(file_names)
+        
+        from crewai import Task, Crew, Process
+        
+        if git_diff.endswith(_TRUNCATED_DIFF_NOTE) or len(git_diff) > MAX_DIFF_BYTES:
+            truncation_note = "The diff is truncated; use the list of changed files for the rest."
+        else:
+            truncation_note = ""
         
         # Create task for diff analysis
         task = Task(
@@ -233,8 +502,11 @@ class DiffAnalysisAgent:
             - If bugs are fixed, use "fix" type
             - If code is refactored, use "refactor" type
 
+            Changed files: {', '.join(file_names)}
+            {truncation_note}
+
             Git Diff:
-            {git_diff}
+            {git_diff[:MAX_DIFF_BYTES]}
 
             Return your analysis in this exact JSON format:
             {{
@@ -257,21 +529,85 @@ class DiffAnalysisAgent:
         )
         
         try:
-            import json
             result = crew.kickoff()
-            analysis = json.loads(str(result))
-            analysis["files"] = file_names
-            return analysis
+            analysis = _json_loads(str(result))
+            # Interned like the table keys, so the later lookups match by identity
+            return Analysis(
+                sys.intern(analysis["change_type"]),
+                sys.intern(analysis["scope"]),
+                sys.intern(analysis.get("confidence", "medium")),
+                analysis.get("reasoning", ""),
+                tuple(file_names),
+            )
         except:
-            # Fallback: analyze based on file types if LLM fails
-            if any('README.md' in f for f in file_names):
-                return {"change_type": "docs", "scope": "readme", "confidence": "high", "files": file_names}
-            elif any('.md' in f for f in file_names):
-                return {"change_type": "docs", "scope": "markdown", "confidence": "high", "files": file_names}
-            elif any('.py' in f for f in file_names):
-                return {"change_type": "feat", "scope": "code", "confidence": "high", "files": file_names}
-            else:
-                return {"change_type": "chore", "scope": "maintenance", "confidence": "low", "files": file_names}
+            return None
+    
+    def _fallback_analysis(self, file_names: list) -> Analysis:
+        """
+        Classify changes from file names alone.
+        
+        Classifies each changed file once, then walks the ordered fallback
+        rules and returns the analysis of the first rule that applies to the
+        change (see _FALLBACK_RULES).
+        
+        Args:
+            file_names (list): List of changed file paths
+            
+        Returns:
+            Analysis: The change type, scope, confidence and files
+        """
+        categories = self._classify_files(file_names)
+        for category, analysis, exclusive in _FALLBACK_RULES:
+            if (categories == {category}) if exclusive else (category in categories):
+                return analysis._replace(files=tuple(file_names))
+        return _DEFAULT_FALLBACK_ANALYSIS._replace(files=tuple(file_names))
+    
+    def analyze_file_names(self, file_names: list) -> Analysis:
+        """
+        Classify changes from file names alone, without the LLM.
+        
+        The rule-based analysis only looks at file names, so callers without
+        an LLM can use this instead of fetching the diff content at all.
+        
+        Args:
+            file_names (list): List of changed file paths
+            
+        Returns:
+            Analysis: The change type, scope, confidence and files
+        """
+        return self._fallback_analysis(file_names)
+    
+    def _classify_files(self, file_names: list) -> set:
+        """
+        Collect the fallback categories of the changed files in one pass.
+        
+        Each file gets one category from its path prefix, exact base name or
+        extension, using dict lookups rather than substring searches, so e.g.
+        "main.pyc" is not treated as Python code. A README.md is additionally
+        counted as markdown.
+        
+        Args:
+            file_names (list): List of changed file paths
+            
+        Returns:
+            set: Category names (e.g. "readme", "markdown", "code", "ci",
+                "build", or "other" for unrecognized files)
+        """
+        categories = set()
+        for file_name in file_names:
+            category = next(
+                (category for prefix, category in _FILE_PREFIX_CATEGORIES
+                 if file_name.startswith(prefix)),
+                None
+            )
+            base_name = file_name.rpartition('/')[2]
+            category = category or _FILE_NAME_CATEGORIES.get(base_name)
+            stem, dot, extension = base_name.rpartition('.')
+            extension_category = _FILE_EXTENSION_CATEGORIES.get(extension) if stem and dot else None
+            if category == "readme" and extension_category:
+                categories.add(extension_category)
+            categories.add(category or extension_category or "other")
+        return categories
 
 
 class SummaryAgent:
@@ -295,9 +631,12 @@ class SummaryAgent:
         - Ensure clarity and readability
         - Maintain consistent tone and style
     
+    Args:
+        use_llm (bool): If False, skip CrewAI and use the rule-based summary only
+    
     Attributes:
-        llm (LLM): The language model for summary generation
-        agent (Agent): The CrewAI agent instance
+        llm (LLM): The language model for summary generation, or None without an LLM
+        agent (Agent): The CrewAI agent instance, or None without an LLM
     
     Example:
         >>> summarizer = SummaryAgent()
@@ -306,31 +645,39 @@ class SummaryAgent:
         'Add user authentication with JWT tokens'
     """
     
-    def __init__(self):
-        self.llm = LLM(model="ollama/llama3:latest", base_url="http://localhost:11434")
-        self.agent = Agent(
+    __slots__ = ("llm", "agent")
+    
+    def __init__(self, use_llm: bool = True):
+        if not use_llm or _import_crewai() is None:
+            self.llm = None
+            self.agent = None
+            return
+        self.llm = _shared_llm()
+        self.agent = _crew_agent(
             role="Technical Summary Specialist",
             goal="Create clear, concise summaries of code changes",
             backstory="""You are a technical writer with expertise in clear communication.
             You excel at creating brief, informative summaries of code changes that
             help developers understand what was modified and why. You focus on the
-            key functionality and impact of changes.""",
-            verbose=False,
-            allow_delegation=False,
-            llm=self.llm
+            key functionality and impact of changes."""
         )
     
-    def create_summary(self, git_diff: str, analysis: Dict[str, Any]) -> str:
+    def create_summary(self, git_diff: str, analysis: Analysis) -> str:
         """Create summary using CrewAI agent."""
+        if self.agent is None:
+            return self._fallback_summary(analysis)
+        
+        from crewai import Task, Crew, Process
+        
         # Create task for summary generation
         task = Task(
             description=f"""
             Create a concise, human-readable summary of the code changes.
             
             Analysis Results:
-            - Change Type: {analysis.get('change_type', 'unknown')}
-            - Scope: {analysis.get('scope', 'unknown')}
-            - Files: {', '.join(analysis.get('files', []))}
+            - Change Type: {analysis.change_type}
+            - Scope: {analysis.scope}
+            - Files: {', '.join(analysis.files)}
             
             Git Diff:
             {git_diff[:1000]}...
@@ -358,18 +705,15 @@ class SummaryAgent:
             return str(result).strip()
         except:
             # Fallback: create simple summary based on analysis
-            change_type = analysis.get('change_type', 'chore')
-            scope = analysis.get('scope', 'maintenance')
-            files = analysis.get('files', [])
-            
-            if change_type == "feat":
-                return f"Add new {scope} functionality"
-            elif change_type == "fix":
-                return f"Fix {scope} issues"
-            elif change_type == "docs":
-                return f"Update {scope} documentation"
-            else:
-                return f"Update {scope} components"
+            return self._fallback_summary(analysis)
+    
+    def _fallback_summary(self, analysis: Analysis) -> str:
+        """Create a simple summary from the analysis without the LLM."""
+        change_type, scope = analysis.change_type, analysis.scope
+        summary = _FALLBACK_SUMMARIES.get((change_type, scope))
+        if summary is None:
+            summary = _compose_fallback_summary(change_type, scope)
+        return summary
 
 
 class CommitFormatterAgent:
@@ -393,9 +737,12 @@ class CommitFormatterAgent:
         - Handle edge cases and special formatting
         - Maintain consistency with conventional commit standards
     
+    Args:
+        use_llm (bool): If False, skip CrewAI and use the rule-based formatting only
+    
     Attributes:
-        llm (LLM): The language model for formatting
-        agent (Agent): The CrewAI agent instance
+        llm (LLM): The language model for formatting, or None without an LLM
+        agent (Agent): The CrewAI agent instance, or None without an LLM
     
     Example:
         >>> formatter = CommitFormatterAgent()
@@ -404,23 +751,36 @@ class CommitFormatterAgent:
         'feat(auth): add authentication features'
     """
     
-    def __init__(self):
-        self.llm = LLM(model="ollama/llama3:latest", base_url="http://localhost:11434")
-        self.agent = Agent(
+    __slots__ = ("llm", "agent")
+    
+    def __init__(self, use_llm: bool = True):
+        if not use_llm or _import_crewai() is None:
+            self.llm = None
+            self.agent = None
+            return
+        self.llm = _shared_llm()
+        self.agent = _crew_agent(
             role="Conventional Commit Specialist",
             goal="Format commit messages according to Conventional Commits specification",
             backstory="""You are an expert in conventional commit standards and best practices.
             You understand the importance of consistent, clear commit messages for
             team collaboration, automated tooling, and project maintenance. You
             excel at formatting commit messages that follow conventional commit
-            standards while being clear and informative.""",
-            verbose=False,
-            allow_delegation=False,
-            llm=self.llm
+            standards while being clear and informative."""
         )
     
-    def format_commit_message(self, change_type: str, scope: str, summary: str) -> str:
-        """Format commit message using CrewAI agent."""
+    def format_commit_message(self, change_type: str, scope: str, summary: Optional[str]) -> str:
+        """
+        Format commit message using CrewAI agent.
+        
+        The summary is only used in the LLM prompt; the rule-based path
+        ignores it, so callers without a formatter LLM may pass None.
+        """
+        if self.agent is None:
+            return self._fallback_message(change_type, scope)
+        
+        from crewai import Task, Crew, Process
+        
         # Create task for commit formatting
         task = Task(
             description=f"""
@@ -465,76 +825,32 @@ class CommitFormatterAgent:
             # Validate the result
             if ':' in formatted_result and len(formatted_result) <= 50:
                 return formatted_result
-            else:
-                # Fallback: create proper conventional commit message manually
-                scope_part = f"({scope})" if scope and scope != "maintenance" else ""
-                
-                # Create a clean description based on change type and scope
-                if change_type == "feat":
-                    if scope == "auth":
-                        description = "add authentication features"
-                    elif scope == "api":
-                        description = "add new API endpoints"
-                    elif scope == "ui":
-                        description = "add new user interface"
-                    elif scope == "code":
-                        description = "add new functionality"
-                    else:
-                        description = "add new functionality"
-                elif change_type == "fix":
-                    if scope == "validation":
-                        description = "fix validation issues"
-                    elif scope == "bug":
-                        description = "fix critical bugs"
-                    else:
-                        description = "fix issues and bugs"
-                elif change_type == "docs":
-                    if scope == "api":
-                        description = "update API documentation"
-                    elif scope == "readme":
-                        description = "update README"
-                    elif scope == "markdown":
-                        description = "update markdown documentation"
-                    else:
-                        description = "update documentation"
-                elif change_type == "refactor":
-                    description = "refactor code structure"
-                elif change_type == "test":
-                    description = "add or update tests"
-                elif change_type == "style":
-                    description = "improve code formatting"
-                elif change_type == "build":
-                    description = "update build configuration"
-                elif change_type == "ci":
-                    description = "update CI/CD pipeline"
-                else:
-                    description = "maintain codebase"
-                
-                return f"{change_type}{scope_part}: {description}"
+            # Fallback: create proper conventional commit message manually
+            return self._fallback_message(change_type, scope)
         except:
             # Fallback: create proper conventional commit message manually
-            scope_part = f"({scope})" if scope and scope != "maintenance" else ""
-            
-            if change_type == "feat":
-                description = "add new functionality"
-            elif change_type == "fix":
-                description = "fix issues and bugs"
-            elif change_type == "docs":
-                description = "update documentation"
-            elif change_type == "refactor":
-                description = "refactor code structure"
-            elif change_type == "test":
-                description = "add or update tests"
-            elif change_type == "style":
-                description = "improve code formatting"
-            elif change_type == "build":
-                description = "update build configuration"
-            elif change_type == "ci":
-                description = "update CI/CD pipeline"
-            else:
-                description = "maintain codebase"
+            return self._fallback_message(change_type, scope)
+    
+    def _fallback_message(self, change_type: str, scope: str) -> str:
+        """
+        Create a conventional commit message without the LLM.
+        
+        Messages for known (change_type, scope) pairs are precomputed. For
+        other pairs the description is looked up for the exact pair first,
+        then for the change type alone. The "maintenance" scope is omitted
+        from the message.
+        
+        Args:
+            change_type (str): The conventional commit type
+            scope (str): The commit scope
             
-            return f"{change_type}{scope_part}: {description}"
+        Returns:
+            str: Commit message in the format type(scope): description
+        """
+        message = _FALLBACK_MESSAGES.get((change_type, scope))
+        if message is None:
+            message = _compose_fallback_message(change_type, scope)
+        return message
 
 
 class GitService:
@@ -545,9 +861,16 @@ class GitService:
     including retrieving staged changes and commit diffs. It handles git
     command execution and error handling.
     
+    Git output is streamed and capped at MAX_DIFF_BYTES so very large diffs
+    do not have to be held in memory in full.
+    
     Methods:
         get_staged_diff(): Retrieve staged changes from git
+        get_staged_files(): Retrieve the names of staged files
         get_commit_diff(): Retrieve diff between commits
+        get_commit_files(): Retrieve changed file names between commits
+        get_log_diffs(): Retrieve per-commit diffs for revision ranges
+        get_log_files(): Retrieve per-commit changed file names for revision ranges
     
     Example:
         >>> git_service = GitService()
@@ -555,6 +878,61 @@ class GitService:
         >>> commit_diff = GitService.get_commit_diff('HEAD~1 HEAD')
     """
     
+    __slots__ = ()
+    
+    @staticmethod
+    def _git_env() -> Dict[str, str]:
+        """
+        Build the environment used for git subprocesses.
+        
+        The current environment is passed through unchanged, so git still
+        finds the user's global config (HOME, or USERPROFILE on Windows).
+        GIT_OPTIONAL_LOCKS=0 lets read-only commands skip taking the index
+        lock, and GIT_TERMINAL_PROMPT=0 makes git fail instead of waiting for
+        credentials.
+        
+        Returns:
+            Dict[str, str]: Environment mapping for subprocess calls
+        """
+        return {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+    
+    @staticmethod
+    def _run_git(args: list, limit: Optional[int] = MAX_DIFF_BYTES) -> str:
+        """
+        Run a git command and return at most `limit` bytes of its output.
+        
+        The output is read from a pipe instead of being buffered in full. If
+        git produces more than `limit` bytes, the process is killed and the
+        output is cut back to the last complete line, followed by
+        _TRUNCATED_DIFF_NOTE.
+        
+        Args:
+            args (list): Arguments passed to git
+            limit (Optional[int]): Maximum bytes to read, or None to read everything
+            
+        Returns:
+            str: The (possibly truncated) command output
+            
+        Raises:
+            subprocess.CalledProcessError: If git exits with a non-zero status
+        """
+        with subprocess.Popen(
+            ["git", *args],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=GitService._git_env()
+        ) as process:
+            output = process.stdout.read(-1 if limit is None else limit)
+            truncated = limit is not None and bool(process.stdout.read(1))
+            if truncated:
+                process.kill()
+        
+        if truncated:
+            output = output[:output.rfind(b"\n") + 1]
+            return output.decode("utf-8", errors="replace") + _TRUNCATED_DIFF_NOTE
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, ["git", *args])
+        return output.decode("utf-8", errors="replace")
+    
     @staticmethod
     def get_staged_diff() -> str:
         """
@@ -572,16 +950,58 @@ class GitService:
             True
         """
         try:
-            result = subprocess.run(
-                ["git", "diff", "--cached"],
-                capture_output=True, text=True, check=True
-            )
-            return result.stdout
+            return GitService._run_git(["diff", "--cached", "--no-color"])
         except subprocess.CalledProcessError:
             return ""
     
     @staticmethod
-    def get_commit_diff(commit_range: str = "HEAD~1 HEAD") -> str:
+    def get_staged_files() -> List[str]:
+        """
+        Get the names of staged files without generating the diff.
+        
+        This is much cheaper than get_staged_diff() for large changes, since
+        git does not have to produce the patch text. The list is read in full,
+        as truncating NUL-separated output at a line break would drop it all.
+        
+        Returns:
+            List[str]: Paths of the staged files, or an empty list if error
+            
+        Example:
+            >>> GitService.get_staged_files()
+            ['README.md', 'src/auth.py']
+        """
+        try:
+            output = GitService._run_git(["diff", "--cached", "--name-only", "-z"], limit=None)
+        except subprocess.CalledProcessError:
+            return []
+        return [name for name in output.split("\0") if name]
+    
+    @staticmethod
+    def get_commit_files(commit_range: str = DEFAULT_COMMIT_RANGE) -> List[str]:
+        """
+        Get the names of files changed between commits without generating the diff.
+        
+        Like get_staged_files(), the NUL-separated list is read in full.
+        
+        Args:
+            commit_range (str): The commit range to compare (default: "HEAD~1 HEAD").
+                Whitespace-separated revisions are passed to git as separate arguments.
+        
+        Returns:
+            List[str]: Paths of the changed files, or an empty list if error
+            
+        Example:
+            >>> GitService.get_commit_files("HEAD~2 HEAD")
+            ['README.md', 'src/auth.py']
+        """
+        try:
+            output = GitService._run_git(["diff", "--name-only", "-z", *commit_range.split()], limit=None)
+        except subprocess.CalledProcessError:
+            return []
+        return [name for name in output.split("\0") if name]
+    
+    @staticmethod
+    def get_commit_diff(commit_range: str = DEFAULT_COMMIT_RANGE) -> str:
         """
         Get diff between commits.
         
@@ -589,7 +1009,8 @@ class GitService:
         retrieve the differences between commits.
         
         Args:
-            commit_range (str): The commit range to compare (default: "HEAD~1 HEAD")
+            commit_range (str): The commit range to compare (default: "HEAD~1 HEAD").
+                Whitespace-separated revisions are passed to git as separate arguments.
             
         Returns:
             str: The git diff output between commits, or empty string if error
@@ -600,13 +1021,111 @@ class GitService:
             True
         """
         try:
-            result = subprocess.run(
-                ["git", "diff", commit_range],
-                capture_output=True, text=True, check=True
-            )
-            return result.stdout
+            return GitService._run_git(["diff", "--no-color", *commit_range.split()])
         except subprocess.CalledProcessError:
             return ""
+    
+    @staticmethod
+    def get_log_diffs(revisions: List[str]) -> List[Tuple[str, str]]:
+        """
+        Get the diff of every commit in the given revision ranges.
+        
+        All ranges are resolved by a single 'git log -p' call whose output is
+        streamed and split on a per-commit separator line, instead of running
+        one git process per commit. Each commit's diff is cut back to the last
+        complete line within MAX_DIFF_BYTES and then ends with
+        _TRUNCATED_DIFF_NOTE, so memory stays bounded by the number of commits
+        rather than the size of the history. Merge commits are skipped.
+        
+        Args:
+            revisions (List[str]): Revisions or ranges understood by git log
+                (e.g. ["v1.0..v1.1", "feature"])
+            
+        Returns:
+            List[Tuple[str, str]]: (commit hash, diff) pairs, newest first
+            
+        Raises:
+            subprocess.CalledProcessError: If git fails, with git's error
+                message in its stderr attribute
+            
+        Example:
+            >>> for sha, diff in GitService.get_log_diffs(["HEAD~3..HEAD"]):
+            ...     print(sha[:7], len(diff))
+        """
+        args = ["git", "log", "-p", "--no-merges", "--no-color",
+                f"--format={_COMMIT_SEPARATOR}%H", *revisions]
+        separator = _COMMIT_SEPARATOR.encode()
+        commits = []
+        sha, lines, size, note = None, [], 0, ""
+        with subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=GitService._git_env()
+        ) as process:
+            for line in process.stdout:
+                if line.startswith(separator):
+                    if sha is not None:
+                        commits.append((sha, b"".join(lines).decode("utf-8", errors="replace") + note))
+                    sha, lines, size, note = line[len(separator):].strip().decode("ascii"), [], 0, ""
+                elif sha is not None and not note and size + len(line) <= MAX_DIFF_BYTES:
+                    lines.append(line)
+                    size += len(line)
+                elif sha is not None:
+                    # Past the cap; no later line of this commit is kept either
+                    note = _TRUNCATED_DIFF_NOTE
+            errors = process.stderr.read()
+        
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, args, stderr=errors.decode("utf-8", errors="replace")
+            )
+        if sha is not None:
+            commits.append((sha, b"".join(lines).decode("utf-8", errors="replace") + note))
+        return commits
+    
+    @staticmethod
+    def get_log_files(revisions: List[str]) -> List[Tuple[str, List[str]]]:
+        """
+        Get the names of the files changed by every commit in the given revision ranges.
+        
+        Like get_log_diffs(), but runs 'git log --name-only -z', so git does
+        not produce any patch text and the file lists are read in full.
+        Merge commits are skipped.
+        
+        Args:
+            revisions (List[str]): Revisions or ranges understood by git log
+                (e.g. ["v1.0..v1.1", "feature"])
+            
+        Returns:
+            List[Tuple[str, List[str]]]: (commit hash, file paths) pairs, newest first
+            
+        Raises:
+            subprocess.CalledProcessError: If git fails, with git's error
+                message in its stderr attribute
+            
+        Example:
+            >>> for sha, file_names in GitService.get_log_files(["HEAD~3..HEAD"]):
+            ...     print(sha[:7], file_names)
+        """
+        args = ["git", "log", "--no-merges", "--name-only", "-z",
+                f"--format={_COMMIT_SEPARATOR}%H", *revisions]
+        with subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=GitService._git_env()
+        ) as process:
+            output, errors = process.communicate()
+        
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, args, stderr=errors.decode("utf-8", errors="replace")
+            )
+        commits = []
+        for field in output.decode("utf-8", errors="replace").split("\0"):
+            # Each commit's file list starts on the line after its header
+            if field.startswith("\n"):
+                field = field[1:]
+            if field.startswith(_COMMIT_SEPARATOR):
+                commits.append((field[len(_COMMIT_SEPARATOR):], []))
+            elif field and commits:
+                commits[-1][1].append(field)
+        return commits
 
 
 class CommitMessageGenerator:
@@ -625,11 +1144,16 @@ class CommitMessageGenerator:
         - SummaryAgent: Creates human-readable summaries
         - CommitFormatterAgent: Formats messages according to conventional commits
     
+    Args:
+        backend (str): "llm" to use the CrewAI agents (default) or "heuristic"
+            to use only the rule-based analysis and formatting
+    
     Attributes:
         diff_analyzer (DiffAnalysisAgent): Agent for diff analysis
         summary_agent (SummaryAgent): Agent for summary generation
         formatter_agent (CommitFormatterAgent): Agent for message formatting
         git_service (GitService): Service for git operations
+        _cache (dict): Recent (analysis, summary, message) results keyed by diff digest
     
     Example:
         >>> generator = CommitMessageGenerator()
@@ -638,13 +1162,19 @@ class CommitMessageGenerator:
         'feat(auth): add authentication features'
     """
     
-    def __init__(self):
-        self.diff_analyzer = DiffAnalysisAgent()
-        self.summary_agent = SummaryAgent()
-        self.formatter_agent = CommitFormatterAgent()
+    __slots__ = ("diff_analyzer", "summary_agent", "formatter_agent", "git_service", "_cache")
+    
+    def __init__(self, backend: str = "llm"):
+        use_llm = backend == "llm"
+        self.diff_analyzer = DiffAnalysisAgent(use_llm)
+        self.summary_agent = SummaryAgent(use_llm)
+        self.formatter_agent = CommitFormatterAgent(use_llm)
         self.git_service = GitService()
+        self._cache = {}
     
-    def generate(self, git_diff: Optional[str] = None, use_staged: bool = False) -> str:
+    def generate(self, git_diff: Optional[str] = None, use_staged: bool = False,
+                 verbose: bool = False, commit_range: str = DEFAULT_COMMIT_RANGE,
+                 file_names: Optional[List[str]] = None) -> str:
         """
         Generate commit message using the multi-agent system.
         
@@ -657,11 +1187,27 @@ class CommitMessageGenerator:
         2. Summary Generation: Create human-readable summary
         3. Commit Formatting: Format message according to conventional commits
         
+        With the heuristic backend, when the changes are read from git, only
+        the changed file names are fetched; the rule-based analysis never
+        needs the diff itself. The LLM backend gets the same full file list
+        alongside the diff, which may be truncated at MAX_DIFF_BYTES.
+        Results are cached by diff digest, so generating for the same diff
+        again skips all three agents; the diff is hashed once, and results
+        that fell back after an LLM failure are not cached.
+        
         Args:
             git_diff (Optional[str]): The git diff string to analyze. If None,
                 will use git service to retrieve diff.
             use_staged (bool): If True, use staged changes instead of commit diff.
                 Defaults to False.
+            verbose (bool): If True, write the result of each agent step to
+                stdout in a single write once generation finishes.
+                Defaults to False.
+            commit_range (str): Commits to compare when neither git_diff nor
+                use_staged is given. Defaults to "HEAD~1 HEAD".
+            file_names (Optional[List[str]]): The changed file paths, if the
+                caller lists them separately from git_diff. The heuristic
+                backend then needs no diff at all.
                 
         Returns:
             str: The generated conventional commit message, or "No changes detected."
@@ -678,28 +1224,83 @@ class CommitMessageGenerator:
             >>> print(message)
             'feat(auth): add authentication features'
         """
+        # Changed files are listed in full; the diff itself may be truncated
         if use_staged:
+            file_names = self.git_service.get_staged_files()
+        elif git_diff is None and file_names is None:
+            file_names = self.git_service.get_commit_files(commit_range)
+        if file_names is not None and not file_names:
+            return "No changes detected."
+        
+        analysis = None
+        if file_names is not None and self.diff_analyzer.agent is None:
+            analysis = self.diff_analyzer.analyze_file_names(file_names)
+            git_diff = ""
+        elif use_staged:
             git_diff = self.git_service.get_staged_diff()
         elif git_diff is None:
-            git_diff = self.git_service.get_commit_diff()
+            git_diff = self.git_service.get_commit_diff(commit_range)
         
-        if not git_diff.strip():
-            return "No changes detected."
+        if analysis is not None:
+            analysis, summary, commit_message = self._run_agents(git_diff, analysis)
+        else:
+            # isspace() avoids the full copy of the diff that strip() would make
+            if not git_diff or git_diff.isspace():
+                return "No changes detected."
+            
+            key = _diff_key(git_diff, file_names)
+            cached = self._cache.get(key)
+            if cached is None:
+                if file_names is None:
+                    file_names = self.diff_analyzer._extract_file_names(git_diff)
+                # Step 1: Diff Analysis Agent, cached here rather than by the analyzer
+                analysis = self.diff_analyzer._analyze_diff(git_diff, file_names)
+                if analysis is None:
+                    # The LLM failed; the fallback result is not cached
+                    cached = self._run_agents(git_diff, self.diff_analyzer._fallback_analysis(file_names))
+                else:
+                    cached = self._run_agents(git_diff, analysis)
+                    if len(self._cache) >= MESSAGE_CACHE_SIZE:
+                        del self._cache[next(iter(self._cache))]
+                    self._cache[key] = cached
+            analysis, summary, commit_message = cached
+        
+        if verbose:
+            if summary is None:
+                summary = self.summary_agent.create_summary(git_diff, analysis)
+            sys.stdout.write(
+                f"[STEP 1] Diff Analysis Agent: type={analysis.change_type} "
+                f"scope={analysis.scope} confidence={analysis.confidence}\n"
+                f"         files: {', '.join(analysis.files) or '(none)'}\n"
+                f"[STEP 2] Summary Agent: {summary}\n"
+                f"[STEP 3] Commit Formatter Agent: {commit_message}\n"
+            )
         
-        # Step 1: Diff Analysis Agent
-        analysis = self.diff_analyzer.analyze_diff(git_diff)
+        return commit_message
+    
+    def _run_agents(self, git_diff: str, analysis: Analysis) -> Tuple[Analysis, Optional[str], str]:
+        """
+        Run the summary and formatting steps for a finished diff analysis.
+        
+        The rule-based formatter does not read the summary, so without a
+        formatter LLM the summary step is skipped and None is returned.
         
+        Returns:
+            Tuple[Analysis, Optional[str], str]: The analysis, summary and
+                commit message
+        """
         # Step 2: Summary Agent
-        summary = self.summary_agent.create_summary(git_diff, analysis)
+        summary = None
+        if self.formatter_agent.agent is not None:
+            summary = self.summary_agent.create_summary(git_diff, analysis)
         
         # Step 3: Commit Formatter Agent
         commit_message = self.formatter_agent.format_commit_message(
-            analysis["change_type"],
-            analysis["scope"],
+            analysis.change_type,
+            analysis.scope,
             summary
         )
-        
-        return commit_message
+        return analysis, summary, commit_message
 
 
 def main():
@@ -713,6 +1314,11 @@ def main():
     Command-line options:
         --staged: Use staged changes instead of last commit
         --copy: Copy generated message to clipboard
+        --verbose: Show the result of each agent step
+        --backend: "llm" (default) or "heuristic" to skip the LLM entirely
+        --batch FILE: Generate a message for each commit in the revision
+            ranges listed in FILE (whitespace-separated; a word starting
+            with '#' starts a comment that runs to the end of the line)
         commit_range: Custom commit range (e.g., HEAD~2 HEAD)
         
     The function handles error cases gracefully and provides helpful feedback
@@ -727,6 +1333,8 @@ def main():
     Returns:
         None: Outputs results to stdout and optionally copies to clipboard
     """
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Git Commit Message Generator - Multi-Agent System with CrewAI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -735,6 +1343,8 @@ Examples:
   python commit_generator.py                    # Use last commit
   python commit_generator.py --staged          # Use staged changes
   python commit_generator.py HEAD~2 HEAD      # Custom commit range
+  python commit_generator.py --backend heuristic  # Rule-based, no LLM
+  python commit_generator.py --batch ranges.txt   # One message per commit
         """
     )
     
@@ -742,32 +1352,66 @@ Examples:
                         help="Use staged changes instead of last commit")
     parser.add_argument("--copy", action="store_true",
                         help="Copy generated message to clipboard")
-    parser.add_argument("commit_range", nargs="?",
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show the result of each agent step")
+    parser.add_argument("--backend", choices=["llm", "heuristic"], default="llm",
+                        help="Generate with the LLM agents or with rules only (default: llm)")
+    parser.add_argument("--batch", type=argparse.FileType("r"), metavar="FILE",
+                        help="Generate messages for every commit in the revision ranges listed in FILE")
+    parser.add_argument("commit_range", nargs="*",
                         help="Custom commit range (e.g., HEAD~2 HEAD)")
     
     args = parser.parse_args()
     
-    generator = CommitMessageGenerator()
+    if args.batch and (args.staged or args.copy or args.commit_range):
+        parser.error("--batch cannot be combined with --staged, --copy or a commit range")
+    
+    generator = CommitMessageGenerator(backend=args.backend)
+    
+    if args.batch:
+        revisions = []
+        with args.batch:
+            for line in args.batch:
+                for revision in line.split():
+                    if revision.startswith("#"):
+                        break
+                    revisions.append(revision)
+        if not revisions:
+            parser.error(f"no revisions listed in {args.batch.name}")
+        try:
+            log_files = generator.git_service.get_log_files(revisions)
+            # The rule-based analysis needs the file names only, so skip the patches
+            log_diffs = {}
+            if generator.diff_analyzer.agent is not None:
+                log_diffs = dict(generator.git_service.get_log_diffs(revisions))
+        except subprocess.CalledProcessError as e:
+            sys.stderr.write(f"Error: {e.stderr.strip() or 'git log failed'}\n")
+            sys.exit(e.returncode)
+        for sha, file_names in log_files:
+            message = generator.generate(
+                git_diff=log_diffs.get(sha), file_names=file_names, verbose=args.verbose
+            )
+            sys.stdout.write(f"{sha[:7]} {message}\n")
+        return
     
     commit_message = generator.generate(
         use_staged=args.staged,
-        git_diff=generator.git_service.get_commit_diff(args.commit_range) if args.commit_range else None
+        verbose=args.verbose,
+        commit_range=" ".join(args.commit_range) or DEFAULT_COMMIT_RANGE
     )
     
-    print("🎯 GENERATED COMMIT MESSAGE:")
-    print("=" * 50)
-    print(commit_message)
-    print("=" * 50)
+    rule = "=" * 50
+    sys.stdout.write(f"GENERATED COMMIT MESSAGE:\n{rule}\n{commit_message}\n{rule}\n")
     
     if args.copy:
         try:
             import pyperclip
             pyperclip.copy(commit_message)
-            print("📋 Copied to clipboard!")
+            print("Copied to clipboard!")
         except ImportError:
-            print("💡 Tip: Install pyperclip to auto-copy to clipboard")
+            print("Tip: Install pyperclip to auto-copy to clipboard")
         except Exception as e:
-            print(f"⚠️  Could not copy to clipboard: {e}")
+            print(f"Warning: Could not copy to clipboard: {e}")
 
 
 if __name__ == "__main__":
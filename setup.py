@@ -33,4 +33,8 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        # Faster parsing of LLM responses; the stdlib json module is the fallback
+        "fast": ["orjson>=3.9.0"],
+    },
 )
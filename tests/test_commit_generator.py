@@ -3,6 +3,7 @@ Comprehensive test suite for Git Commit Message Generator
 Tests multi-agent system functionality
 """
 
+import io
 import unittest
 import tempfile
 import os
@@ -16,7 +17,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from commit_generator import (
     DiffAnalysisAgent, SummaryAgent, CommitFormatterAgent, GitService, 
-    CommitMessageGenerator, ChangeType, Scope
+    CommitMessageGenerator, Analysis, ChangeType, Scope, _shared_llm, _crew_agent,
+    main, MAX_DIFF_BYTES, _TRUNCATED_DIFF_NOTE, _diff_key
 )
 
 
@@ -66,6 +68,15 @@ index 0000000..1234567
         self.assertIn("src/main.py", files)
         self.assertIn("tests/test_main.py", files)
     
+    def test_extract_file_names_ignores_indented_headers(self):
+        """Test only headers at the start of a line are treated as files."""
+        git_diff = """diff --git a/src/main.py b/src/main.py
++    text = "diff --git a/fake.py b/fake.py"
+diff --git a/docs/guide.md b/docs/guide.md
+"""
+        files = self.analyzer._extract_file_names(git_diff)
+        self.assertEqual(files, ["src/main.py", "docs/guide.md"])
+    
     def test_analyze_python_files(self):
         """Test analysis of Python files."""
         git_diff = """diff --git a/src/main.py b/src/main.py
@@ -97,6 +108,105 @@ index 1234567..abcdefg 100644
         self.assertEqual(result["change_type"], ChangeType.DOCS.value)
         self.assertEqual(result["scope"], Scope.MARKDOWN.value)
         self.assertEqual(result["confidence"], "high")
+    
+    def test_classify_files_uses_exact_extensions(self):
+        """Test files are classified by exact name and extension."""
+        categories = self.analyzer._classify_files(
+            ["docs/README.md", "build/main.pyc", "src/app.py", ".md"]
+        )
+        self.assertEqual(categories, {"readme", "markdown", "code", "other"})
+        self.assertEqual(self.analyzer._classify_files(["main.pyc", "notes.mdx"]), {"other"})
+    
+    def test_classify_files_extension_aliases(self):
+        """Test alternative Python and documentation extensions."""
+        categories = self.analyzer._classify_files(["stubs/app.pyi", "ext/fast.pyx", "CHANGES.markdown"])
+        self.assertEqual(categories, {"code", "markdown"})
+        result = self.analyzer.analyze_file_names(["docs/index.rst"])
+        self.assertEqual(result.change_type, ChangeType.DOCS.value)
+    
+    def test_analyze_file_names_ci_and_build(self):
+        """Test CI- and build-only changes are classified as ci and build."""
+        result = self.analyzer.analyze_file_names([".github/workflows/test.yml", "Jenkinsfile"])
+        self.assertEqual(result.change_type, ChangeType.CI.value)
+        result = self.analyzer.analyze_file_names(["setup.py", "requirements.txt"])
+        self.assertEqual(result.change_type, ChangeType.BUILD.value)
+        result = self.analyzer.analyze_file_names(["requirements.txt", "src/app.py"])
+        self.assertEqual(result.change_type, ChangeType.FEAT.value)
+    
+    def test_analyze_diff_caches_by_diff(self):
+        """Test repeated analysis of the same diff is served from the cache."""
+        analyzer = DiffAnalysisAgent(use_llm=False)
+        git_diff = "diff --git a/src/app.py b/src/app.py\n+x = 1\n"
+        with patch.object(DiffAnalysisAgent, '_fallback_analysis', autospec=True,
+                          side_effect=DiffAnalysisAgent._fallback_analysis) as spy:
+            first = analyzer.analyze_diff(git_diff)
+            second = analyzer.analyze_diff(git_diff)
+        spy.assert_called_once()
+        self.assertIs(second, first)
+        self.assertEqual(second.scope, Scope.CODE.value)
+        self.assertEqual(second.files, ("src/app.py",))
+    
+    def test_llm_prompt_marks_truncated_diff(self):
+        """Test the LLM is told about truncation and given the full file list."""
+        analyzer = DiffAnalysisAgent(use_llm=False)
+        analyzer.agent = MagicMock()
+        crewai = MagicMock()
+        git_diff = "diff --git a/src/app.py b/src/app.py\n+x = 1\n" + _TRUNCATED_DIFF_NOTE
+        with patch.dict(sys.modules, {"crewai": crewai}):
+            result = analyzer.analyze_diff(git_diff, ["src/app.py", "src/util.py"])
+        prompt = crewai.Task.call_args.kwargs["description"]
+        self.assertIn("The diff is truncated", prompt)
+        self.assertIn("Changed files: src/app.py, src/util.py", prompt)
+        self.assertEqual(result.files, ("src/app.py", "src/util.py"))
+    
+    def test_llm_failure_is_not_cached(self):
+        """Test the fallback after an LLM failure is not cached, but a success is."""
+        analyzer = DiffAnalysisAgent(use_llm=False)
+        analyzer.agent = MagicMock()
+        crewai = MagicMock()
+        crewai.Crew.return_value.kickoff.side_effect = [
+            "not json", '{"change_type": "fix", "scope": "api"}'
+        ]
+        git_diff = "diff --git a/src/app.py b/src/app.py\n+x = 1\n"
+        with patch.dict(sys.modules, {"crewai": crewai}):
+            first = analyzer.analyze_diff(git_diff)
+            second = analyzer.analyze_diff(git_diff)
+            third = analyzer.analyze_diff(git_diff)
+        self.assertEqual(first.scope, Scope.CODE.value)
+        self.assertEqual((second.change_type, second.scope), ("fix", "api"))
+        self.assertIs(third, second)
+        self.assertEqual(crewai.Crew.return_value.kickoff.call_count, 2)
+    
+    def test_analyze_diff_lone_surrogate(self):
+        """Test a diff with an unpaired surrogate can be hashed and analyzed."""
+        analyzer = DiffAnalysisAgent(use_llm=False)
+        result = analyzer.analyze_diff("diff --git a/src/app.py b/src/app.py\n+x = '\ud800'\n")
+        self.assertEqual(result.scope, Scope.CODE.value)
+    
+    @patch('commit_generator._diff_key')
+    def test_analyze_diff_empty_fast_path(self, mock_key):
+        """Test empty diffs are classified without hashing or analysis."""
+        result = self.analyzer.analyze_diff("  \n")
+        self.assertEqual(result.change_type, ChangeType.CHORE.value)
+        self.assertEqual(result.files, ())
+        mock_key.assert_not_called()
+
+
+class TestSummaryAgent(unittest.TestCase):
+    """Test the SummaryAgent rule-based fallback."""
+    
+    def setUp(self):
+        self.summarizer = SummaryAgent(use_llm=False)
+    
+    def test_fallback_summary_known_scope(self):
+        """Test summaries for known change types and scopes."""
+        summary = self.summarizer.create_summary("", Analysis("fix", "validation", "medium"))
+        self.assertEqual(summary, "Fix validation issues")
+    
+    def test_fallback_summary_unknown_scope(self):
+        """Test summaries for scopes outside the Scope enum."""
+        summary = self.summarizer.create_summary("", Analysis("style", "css", "low"))
+        self.assertEqual(summary, "Update css components")
 
 
 class TestCommitFormatterAgent(unittest.TestCase):
@@ -124,6 +234,12 @@ class TestCommitFormatterAgent(unittest.TestCase):
         """Test formatting chore with maintenance scope."""
         result = self.formatter.format_commit_message(ChangeType.CHORE.value, Scope.MAINTENANCE.value, "maintain codebase")
         self.assertEqual(result, "chore: maintain codebase")
+    
+    def test_format_unknown_scope(self):
+        """Test messages for pairs outside the precomputed table."""
+        formatter = CommitFormatterAgent(use_llm=False)
+        result = formatter.format_commit_message(ChangeType.FEAT.value, "css", "")
+        self.assertEqual(result, "feat(css): add new functionality")
 
 
 class TestGitService(unittest.TestCase):
@@ -132,23 +248,141 @@ class TestGitService(unittest.TestCase):
     def setUp(self):
         self.git_service = GitService()
     
-    @patch('subprocess.run')
-    def test_get_staged_diff_success(self, mock_run):
+    def _mock_process(self, mock_popen, chunks, returncode=0):
+        process = mock_popen.return_value.__enter__.return_value
+        process.stdout.read.side_effect = chunks
+        process.returncode = returncode
+        return process
+    
+    @patch('subprocess.Popen')
+    def test_get_staged_diff_success(self, mock_popen):
         """Test successful staged diff retrieval."""
-        mock_run.return_value = MagicMock(stdout="diff content", returncode=0)
+        self._mock_process(mock_popen, [b"diff content", b""])
         result = self.git_service.get_staged_diff()
         self.assertEqual(result, "diff content")
-        mock_run.assert_called_once_with(
-            ["git", "diff", "--cached"],
-            capture_output=True, text=True, check=True
+        mock_popen.assert_called_once_with(
+            ["git", "diff", "--cached", "--no-color"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=GitService._git_env()
+        )
+    
+    @patch('subprocess.Popen')
+    def test_get_commit_diff_splits_range(self, mock_popen):
+        """Test commit ranges are passed to git as separate revisions."""
+        self._mock_process(mock_popen, [b"diff content", b""])
+        self.git_service.get_commit_diff("HEAD~2 HEAD")
+        self.assertEqual(mock_popen.call_args[0][0], ["git", "diff", "--no-color", "HEAD~2", "HEAD"])
+    
+    @patch.object(GitService, '_run_git')
+    def test_get_staged_files(self, mock_run_git):
+        """Test staged file names are read from NUL-separated output."""
+        mock_run_git.return_value = "README.md\0src/my file.py\0"
+        self.assertEqual(self.git_service.get_staged_files(), ["README.md", "src/my file.py"])
+        mock_run_git.assert_called_once_with(["diff", "--cached", "--name-only", "-z"], limit=None)
+    
+    @patch('subprocess.Popen')
+    def test_get_staged_files_beyond_diff_limit(self, mock_popen):
+        """Test long staged file lists are not truncated to nothing."""
+        names = [f"src/module_{i:04d}_{'x' * 40}.py" for i in range(1500)]
+        output = "\0".join(names).encode() + b"\0"
+        self.assertGreater(len(output), MAX_DIFF_BYTES)
+        process = self._mock_process(mock_popen, [output])
+        self.assertEqual(self.git_service.get_staged_files(), names)
+        process.stdout.read.assert_called_once_with(-1)
+    
+    @patch.object(GitService, '_run_git', return_value="docs/guide.md\0")
+    def test_get_commit_files(self, mock_run_git):
+        """Test file names for a commit range are read without the patch text."""
+        self.assertEqual(self.git_service.get_commit_files("HEAD~2 HEAD"), ["docs/guide.md"])
+        mock_run_git.assert_called_once_with(["diff", "--name-only", "-z", "HEAD~2", "HEAD"], limit=None)
+    
+    @patch('subprocess.Popen')
+    def test_get_commit_files_beyond_diff_limit(self, mock_popen):
+        """Test long file lists for a commit range are not truncated to nothing."""
+        names = [f"src/module_{i:04d}_{'x' * 40}.py" for i in range(1500)]
+        output = "\0".join(names).encode() + b"\0"
+        self.assertGreater(len(output), MAX_DIFF_BYTES)
+        process = self._mock_process(mock_popen, [output])
+        self.assertEqual(self.git_service.get_commit_files(), names)
+        process.stdout.read.assert_called_once_with(-1)
+    
+    @patch('subprocess.Popen')
+    def test_get_log_diffs_splits_commits(self, mock_popen):
+        """Test one git log call is split into per-commit diffs."""
+        process = self._mock_process(mock_popen, [b""])
+        process.stdout.__iter__.return_value = iter([
+            b"###COMMIT abc123\n", b"\n", b"diff --git a/a.py b/a.py\n", b"+x\n",
+            b"###COMMIT def456\n", b"\n", b"diff --git a/b.md b/b.md\n", b"+y\n",
+        ])
+        process.stderr.read.return_value = b""
+        result = self.git_service.get_log_diffs(["HEAD~2..HEAD"])
+        self.assertEqual(result, [
+            ("abc123", "\ndiff --git a/a.py b/a.py\n+x\n"),
+            ("def456", "\ndiff --git a/b.md b/b.md\n+y\n"),
+        ])
+        mock_popen.assert_called_once()
+    
+    @patch('commit_generator.MAX_DIFF_BYTES', 10)
+    @patch('subprocess.Popen')
+    def test_get_log_diffs_caps_each_diff(self, mock_popen):
+        """Test each commit's diff is cut back to complete lines within the cap."""
+        process = self._mock_process(mock_popen, [b""])
+        process.stdout.__iter__.return_value = iter([
+            b"###COMMIT abc123\n", b"+abcd\n", b"+efghij\n", b"+k\n",
+            b"###COMMIT def456\n", b"+y\n",
+        ])
+        process.stderr.read.return_value = b""
+        result = self.git_service.get_log_diffs(["HEAD~2..HEAD"])
+        self.assertEqual(result, [("abc123", "+abcd\n" + _TRUNCATED_DIFF_NOTE), ("def456", "+y\n")])
+    
+    @patch('subprocess.Popen')
+    def test_get_log_files_splits_commits(self, mock_popen):
+        """Test one name-only git log call is split into per-commit file lists."""
+        process = self._mock_process(mock_popen, [])
+        process.communicate.return_value = (
+            b"###COMMIT abc123\0\na.py\0docs/my file.md\0###COMMIT def456\0\nb.md\0", b""
         )
+        result = self.git_service.get_log_files(["HEAD~2..HEAD"])
+        self.assertEqual(result, [("abc123", ["a.py", "docs/my file.md"]), ("def456", ["b.md"])])
+        self.assertNotIn("-p", mock_popen.call_args[0][0])
+    
+    @patch('subprocess.Popen')
+    def test_get_log_diffs_failure_reports_git_error(self, mock_popen):
+        """Test git failures are raised with git's error message."""
+        process = self._mock_process(mock_popen, [b""], returncode=128)
+        process.stdout.__iter__.return_value = iter([])
+        process.stderr.read.return_value = b"fatal: bad revision 'nonexistent..HEAD'\n"
+        with self.assertRaises(subprocess.CalledProcessError) as context:
+            self.git_service.get_log_diffs(["nonexistent..HEAD"])
+        self.assertIn("bad revision", context.exception.stderr)
+    
+    def test_git_env_disables_optional_locks(self):
+        """Test git runs without optional locks or terminal prompts."""
+        env = GitService._git_env()
+        self.assertEqual(env["GIT_OPTIONAL_LOCKS"], "0")
+        self.assertEqual(env["GIT_TERMINAL_PROMPT"], "0")
+        self.assertEqual(env.get("PATH"), os.environ.get("PATH"))
+    
+    def test_git_env_follows_current_environment(self):
+        """Test the git environment is built from os.environ on every call."""
+        GitService._git_env()
+        with patch.dict(os.environ, {"USERPROFILE": r"C:\Users\dev"}):
+            self.assertEqual(GitService._git_env()["USERPROFILE"], r"C:\Users\dev")
     
-    @patch('subprocess.run')
-    def test_get_staged_diff_failure(self, mock_run):
+    @patch('subprocess.Popen')
+    def test_get_staged_diff_failure(self, mock_popen):
         """Test staged diff retrieval failure."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "git")
+        self._mock_process(mock_popen, [b"", b""], returncode=1)
         result = self.git_service.get_staged_diff()
         self.assertEqual(result, "")
+    
+    @patch('subprocess.Popen')
+    def test_get_staged_diff_truncates_large_output(self, mock_popen):
+        """Test oversized diffs are cut at the last complete line and marked."""
+        process = self._mock_process(mock_popen, [b"+line one\n+line tw", b"o"], returncode=-9)
+        result = self.git_service.get_staged_diff()
+        self.assertEqual(result, "+line one\n" + _TRUNCATED_DIFF_NOTE)
+        process.kill.assert_called_once()
 
 
 class TestCommitMessageGenerator(unittest.TestCase):
@@ -157,6 +391,105 @@ class TestCommitMessageGenerator(unittest.TestCase):
     def setUp(self):
         self.generator = CommitMessageGenerator()
     
+    def test_heuristic_backend_skips_llm(self):
+        """Test the heuristic backend does not create LLM agents."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        self.assertIsNone(generator.diff_analyzer.agent)
+        self.assertIsNone(generator.summary_agent.agent)
+        self.assertIsNone(generator.formatter_agent.agent)
+    
+    @patch('commit_generator._import_crewai')
+    def test_llm_backend_shares_one_llm(self, mock_import):
+        """Test all agents reuse a single LLM client."""
+        for cache in (_shared_llm, _crew_agent):
+            cache.cache_clear()
+            self.addCleanup(cache.cache_clear)
+        generator = CommitMessageGenerator(backend="llm")
+        self.assertIs(generator.diff_analyzer.llm, generator.summary_agent.llm)
+        self.assertIs(generator.summary_agent.llm, generator.formatter_agent.llm)
+        mock_import.return_value.LLM.assert_called_once()
+    
+    @patch('commit_generator._import_crewai')
+    def test_llm_agents_built_once_per_process(self, mock_import):
+        """Test generators reuse the CrewAI agents instead of rebuilding them."""
+        for cache in (_shared_llm, _crew_agent):
+            cache.cache_clear()
+            self.addCleanup(cache.cache_clear)
+        first = CommitMessageGenerator(backend="llm")
+        second = CommitMessageGenerator(backend="llm")
+        self.assertIs(first.diff_analyzer.agent, second.diff_analyzer.agent)
+        self.assertEqual(mock_import.return_value.Agent.call_count, 3)
+    
+    def test_heuristic_staged_skips_diff(self):
+        """Test staged changes are classified from file names without fetching the diff."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        with patch.object(GitService, 'get_staged_files', return_value=["src/auth.py"]), \
+                patch.object(GitService, 'get_staged_diff') as mock_diff:
+            result = generator.generate(use_staged=True)
+        self.assertEqual(result, "feat(code): add new functionality")
+        mock_diff.assert_not_called()
+    
+    def test_heuristic_commit_range_skips_diff(self):
+        """Test commit ranges are classified from file names without fetching the diff."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        with patch.object(GitService, 'get_commit_files', return_value=["README.md"]) as mock_files, \
+                patch.object(GitService, 'get_commit_diff') as mock_diff:
+            result = generator.generate(commit_range="HEAD~3 HEAD")
+        self.assertEqual(result, "docs(readme): update README")
+        mock_files.assert_called_once_with("HEAD~3 HEAD")
+        mock_diff.assert_not_called()
+    
+    def test_llm_staged_uses_full_file_list(self):
+        """Test the analyzer gets the staged file list, not names from the cut diff."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        generator.diff_analyzer.agent = MagicMock()
+        git_diff = "diff --git a/src/app.py b/src/app.py\n+x = 1\n" + _TRUNCATED_DIFF_NOTE
+        with patch.object(GitService, 'get_staged_files', return_value=["src/app.py", "src/util.py"]), \
+                patch.object(GitService, 'get_staged_diff', return_value=git_diff), \
+                patch.object(DiffAnalysisAgent, '_analyze_diff',
+                             return_value=Analysis("feat", "code", "high")) as mock_analyze:
+            generator.generate(use_staged=True)
+        mock_analyze.assert_called_once_with(git_diff, ["src/app.py", "src/util.py"])
+    
+    def test_heuristic_staged_without_files(self):
+        """Test an empty staged file list reports no changes."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        with patch.object(GitService, 'get_staged_files', return_value=[]):
+            self.assertEqual(generator.generate(use_staged=True), "No changes detected.")
+    
+    def test_generate_caches_by_diff(self):
+        """Test generating for the same diff twice runs the agents once."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        git_diff = "diff --git a/src/app.py b/src/app.py\n+x = 1\n"
+        with patch.object(DiffAnalysisAgent, '_analyze_diff', autospec=True,
+                          side_effect=DiffAnalysisAgent._analyze_diff) as spy, \
+                patch('commit_generator._diff_key', side_effect=_diff_key) as key_spy:
+            first = generator.generate(git_diff)
+            second = generator.generate(git_diff)
+        self.assertEqual(first, second)
+        spy.assert_called_once()
+        self.assertEqual(key_spy.call_count, 2)
+        self.assertEqual(generator.diff_analyzer._cache, {})
+    
+    def test_generate_does_not_cache_llm_failure(self):
+        """Test a message built after an LLM analysis failure is not cached."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        git_diff = "diff --git a/src/app.py b/src/app.py\n+x = 1\n"
+        with patch.object(DiffAnalysisAgent, '_analyze_diff', return_value=None) as mock_analyze:
+            first = generator.generate(git_diff)
+            second = generator.generate(git_diff)
+        self.assertEqual(first, "feat(code): add new functionality")
+        self.assertEqual(second, first)
+        self.assertEqual(mock_analyze.call_count, 2)
+    
+    def test_heuristic_skips_unused_summary(self):
+        """Test the summary step is skipped when the formatter ignores it."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        with patch.object(SummaryAgent, 'create_summary') as mock_summary:
+            result = generator.generate("diff --git a/src/app.py b/src/app.py\n+x = 1\n")
+        self.assertEqual(result, "feat(code): add new functionality")
+        mock_summary.assert_not_called()
+    
     def test_generate_empty_diff(self):
         """Test generation with empty diff."""
         result = self.generator.generate("")
@@ -167,6 +500,17 @@ class TestCommitMessageGenerator(unittest.TestCase):
         result = self.generator.generate("   \n  \t  ")
         self.assertEqual(result, "No changes detected.")
     
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_generate_verbose_reports_steps(self, mock_stdout):
+        """Test verbose generation reports every agent step."""
+        generator = CommitMessageGenerator(backend="heuristic")
+        generator.generate("diff --git a/src/app.py b/src/app.py\n+x = 1\n", verbose=True)
+        output = mock_stdout.getvalue()
+        self.assertIn("[STEP 1] Diff Analysis Agent: type=feat scope=code", output)
+        self.assertIn("files: src/app.py", output)
+        self.assertIn("[STEP 2] Summary Agent: Add new code functionality", output)
+        self.assertIn("[STEP 3] Commit Formatter Agent: feat(code): add new functionality", output)
+    
     def test_generate_python_changes(self):
         """Test generation for Python file changes."""
         git_diff = """diff --git a/src/main.py b/src/main.py
@@ -230,6 +574,61 @@ index 1234567..abcdefg 100644
         self.assertEqual(result, "docs(markdown): update markdown documentation")
 
 
+class TestMain(unittest.TestCase):
+    """Test the command-line interface."""
+    
+    def _batch_file(self, content):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+        with handle:
+            handle.write(content)
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
+    
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_batch_rejects_conflicting_options(self, mock_stderr):
+        """Test --batch cannot be combined with options it would ignore."""
+        batch = self._batch_file("HEAD~1..HEAD\n")
+        for extra in (["--staged"], ["--copy"], ["HEAD~2", "HEAD"]):
+            with patch.object(sys, 'argv', ["commit_generator.py", "--batch", batch, *extra]):
+                with self.assertRaises(SystemExit) as context:
+                    main()
+            self.assertEqual(context.exception.code, 2)
+    
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch.object(GitService, 'get_log_diffs')
+    @patch.object(GitService, 'get_log_files')
+    def test_batch_heuristic_uses_file_names(self, mock_log_files, mock_log_diffs, mock_stdout):
+        """Test batch mode prints one message per commit without fetching patches."""
+        mock_log_files.return_value = [
+            ("abc1234def", ["README.md"]),
+            ("def5678abc", ["src/app.py"]),
+        ]
+        batch = self._batch_file("# release\nHEAD~2..HEAD  # recent work\n")
+        with patch.object(sys, 'argv', ["commit_generator.py", "--backend", "heuristic", "--batch", batch]):
+            main()
+        mock_log_files.assert_called_once_with(["HEAD~2..HEAD"])
+        mock_log_diffs.assert_not_called()
+        self.assertEqual(
+            mock_stdout.getvalue(),
+            "abc1234 docs(readme): update README\n"
+            "def5678 feat(code): add new functionality\n"
+        )
+    
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch.object(GitService, 'get_log_files')
+    def test_batch_git_failure_exits_non_zero(self, mock_log_files, mock_stderr):
+        """Test git errors in batch mode are reported instead of swallowed."""
+        mock_log_files.side_effect = subprocess.CalledProcessError(
+            128, ["git", "log"], stderr="fatal: bad revision 'nonexistent..HEAD'\n"
+        )
+        batch = self._batch_file("nonexistent..HEAD\n")
+        with patch.object(sys, 'argv', ["commit_generator.py", "--backend", "heuristic", "--batch", batch]):
+            with self.assertRaises(SystemExit) as context:
+                main()
+        self.assertEqual(context.exception.code, 128)
+        self.assertIn("bad revision", mock_stderr.getvalue())
+
+
 class TestEdgeCases(unittest.TestCase):
     """Test edge cases and error conditions."""
     